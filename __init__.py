@@ -15,8 +15,15 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-import logging
+import collections
+import functools
+import gc
+import importlib
+import os
+import sys
 
+# Blender's addon scanner reads this dictionary with ast.literal_eval() without
+# importing the package, so it must remain a plain literal.
 bl_info = {
     'name' : 'Y.A.V.N.E.',
     'description' : 'Yet another vertex normal editor',
@@ -27,54 +34,162 @@ bl_info = {
     'category' : 'Mesh'
 }
 
-if 'bpy' not in locals():
+# The sentinel persists across re-imports of this package, and it is only set
+# once the first import has completed successfully.
+try:
+    _INITIALIZED
+except NameError:
+    _INITIALIZED = False
+
+if not _INITIALIZED:
     import bpy
-    from . import operators
-    from . import panel
-    from . import preferences
-else:
-    import imp
-    imp.reload(operators)
-    imp.reload(panel)
-    imp.reload(preferences)
-
-classes = (
-    operators.MESH_OT_YAVNEBase,
-    operators.MESH_OT_GetNormalVector,
-    operators.MESH_OT_ManageFaceNormalInfluence,
-    operators.MESH_OT_ManageVertexNormalWeight,
-    operators.MESH_OT_MergeVertexNormals,
-    operators.MESH_OT_PickShadingSource,
-    operators.MESH_OT_SetNormalVector,
-    operators.MESH_OT_TransferShading,
-    operators.MESH_OT_UpdateVertexNormals,
-    panel.MESH_PT_YAVNEPanel,
-    preferences.YAVNEPrefs
+    _LOADED_MTIME = {}
+elif os.environ.get('YAVNE_DEV'):
+    # Only reload submodules whose source has changed since they were loaded.
+    # Reloading is a development aid, so it is opt-in via YAVNE_DEV=1.
+    for name, loaded_mtime in list(_LOADED_MTIME.items()):
+        module = sys.modules[__package__ + '.' + name]
+        mtime = os.path.getmtime(module.__file__)
+        if loaded_mtime != mtime:
+            importlib.reload(module)
+            _LOADED_MTIME[name] = mtime
+
+# Classes are named by (module, class) pairs so that submodules are only
+# imported once their classes are registered.
+_CLASS_SPECS = (
+    ('operators', 'MESH_OT_YAVNEBase'),
+    ('operators', 'MESH_OT_GetNormalVector'),
+    ('operators', 'MESH_OT_ManageFaceNormalInfluence'),
+    ('operators', 'MESH_OT_ManageVertexNormalWeight'),
+    ('operators', 'MESH_OT_MergeVertexNormals'),
+    ('operators', 'MESH_OT_PickShadingSource'),
+    ('operators', 'MESH_OT_SetNormalVector'),
+    ('operators', 'MESH_OT_TransferShading'),
+    ('operators', 'MESH_OT_UpdateVertexNormals'),
+    ('panel', 'MESH_PT_YAVNEPanel'),
+    ('preferences', 'YAVNEPrefs')
 )
 
+# The panel and preferences are needed for UI discovery at startup, whereas
+# operator registration is deferred until Blender's event loop is running.
+_EAGER_MODULES = {'panel', 'preferences'}
+_EAGER_CLASS_SPECS = tuple(
+    spec for spec in _CLASS_SPECS if spec[0] in _EAGER_MODULES)
+_DEFERRED_CLASS_SPECS = tuple(
+    spec for spec in _CLASS_SPECS if spec[0] not in _EAGER_MODULES)
+
+# Unregistration order is fixed, so it is computed once.
+_REVERSED_CLASS_SPECS = tuple(reversed(_CLASS_SPECS))
+_REVERSED_EAGER_CLASS_SPECS = tuple(reversed(_EAGER_CLASS_SPECS))
+
+
+@functools.lru_cache(maxsize = None)
+def _resolve(spec):
+    '''
+    Materializes a class from its (module, class) name pair
+
+    Parameters:
+        spec (tuple<str, str>): Submodule and class names
+
+    Returns:
+        type: Referenced class
+    '''
+    module_name, class_name = spec
+    module = importlib.import_module('.' + module_name, __package__)
+
+    # Record when the submodule was loaded for development reloads.
+    if module_name not in _LOADED_MTIME:
+        _LOADED_MTIME[module_name] = os.path.getmtime(module.__file__)
+
+    return getattr(module, class_name)
+
+
+@functools.lru_cache(maxsize = 1)
+def _yavne_log_format():
+    '''
+    Builds the logging format template for this addon
+
+    Returns:
+        str: Logging format template
+    '''
+    prefix = sys.intern('[%(levelname)s] (%(asctime)s) ' + __package__ + '.')
+    return prefix + '%(module)s.%(funcName)s():L%(lineno)s - %(message)s'
+
+
+def _apply_to_classes(func, specs):
+    '''
+    Applies given (un)registration function to each referenced class while
+    cyclic garbage collection is paused
+
+    Parameters:
+        func (callable): bpy.utils.register_class or unregister_class
+        specs (seq<tuple<str, str>>): Submodule and class name pairs
+    '''
+    # Registration allocates many small RNA objects without creating any
+    # garbage, so generational collection passes would be wasted effort.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # Consume the iterator at C speed without storing any results.
+        collections.deque(map(func, map(_resolve, specs)), maxlen = 0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+            gc.collect()
+
+
+def _finish_register():
+
+    # Register deferred classes of this Blender addon.
+    _apply_to_classes(bpy.utils.register_class, _DEFERRED_CLASS_SPECS)
+
+    # Do not repeat this timer.
+    return None
+
 
 def register():
+    import logging
 
-    # Configure the logging service.
-    logging_format = (
-        '[%(levelname)s] ' +
-        '(%(asctime)s) ' +
-        '{0}.%(module)s.%(funcName)s():L%(lineno)s'.format(__package__) +
-        ' - %(message)s'
-    )
-    logging.basicConfig(
-        level = logging.DEBUG,
-        format = logging_format,
-        datefmt = '%Y/%m/%d %H:%M:%S'
-    )
+    # Configure the logging service unless it has already been configured.
+    # Debug output can be enabled by setting YAVNE_LOGLEVEL=DEBUG. Unknown
+    # level names fall back to WARNING rather than failing to enable the addon.
+    if not logging.getLogger().handlers:
+        level = os.environ.get('YAVNE_LOGLEVEL', 'WARNING').upper()
+        if not isinstance(logging.getLevelName(level), int):
+            level = 'WARNING'
+        logging.basicConfig(
+            level = level,
+            format = _yavne_log_format(),
+            datefmt = '%Y/%m/%d %H:%M:%S'
+        )
 
     # Register this Blender addon.
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    _apply_to_classes(bpy.utils.register_class, _EAGER_CLASS_SPECS)
+
+    # Timers never fire in background mode, so finish registering right away.
+    # Otherwise, defer it off of the startup critical path. The timer must be
+    # persistent to survive loading a file before it fires.
+    if bpy.app.background:
+        _finish_register()
+    else:
+        bpy.app.timers.register(
+            _finish_register,
+            first_interval = 0.0,
+            persistent = True
+        )
 
 
 def unregister():
 
+    # Cancel deferred registration if it has not happened yet.
+    if bpy.app.timers.is_registered(_finish_register):
+        bpy.app.timers.unregister(_finish_register)
+        registered_specs = _REVERSED_EAGER_CLASS_SPECS
+    else:
+        registered_specs = _REVERSED_CLASS_SPECS
+
     # Unregister this Blender addon.
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    _apply_to_classes(bpy.utils.unregister_class, registered_specs)
+
+
+_INITIALIZED = True
@@ -17,14 +17,12 @@
 
 import bmesh
 import bpy
-import ctypes
 import gpu
 import gpu_extras.batch
 import math
 import mathutils
-import multiprocessing
-import multiprocessing.sharedctypes
-import os
+import mathutils.kdtree
+import numpy as np
 from . import types
 from . import utils
 
@@ -75,6 +73,59 @@ class MESH_OT_YAVNEBase(bpy.types.Operator):
         # Update the mesh.
         bmesh.update_edit_mesh(mesh)
 
+        # Cache the BMesh and its custom data layers for use by subclasses.
+        self.cache_bmesh(bm)
+
+    def cache_bmesh(self, bm):
+        '''
+        Caches given edit mode BMesh along with its custom data layers
+
+        Parameters:
+            bm (bmesh.types.BMesh): Edit mode BMesh data
+        '''
+        self.bm = bm
+        self.layers = {
+            'vertex-normal-weight': bm.verts.layers.int['vertex-normal-weight'],
+            'face-normal-influence': bm.faces.layers.int['face-normal-influence'],
+            'loop-normal-x': bm.loops.layers.float['loop-normal-x'],
+            'loop-normal-y': bm.loops.layers.float['loop-normal-y'],
+            'loop-normal-z': bm.loops.layers.float['loop-normal-z']
+        }
+
+    def get_bmesh(self, mesh):
+        '''
+        Gets the cached edit mode BMesh, refreshing the cache if the BMesh has
+        been replaced in the meantime (e.g. by undo before a redo)
+
+        Parameters:
+            mesh (bpy.types.Mesh): Mesh data in Edit mode
+
+        Returns:
+            bmesh.types.BMesh: Edit mode BMesh data
+        '''
+        if not self.bm.is_valid:
+            self.cache_bmesh(bmesh.from_edit_mesh(mesh))
+        return self.bm
+
+    def set_loop_normals(self, loops, vn_local):
+        '''
+        Stores given object space normal vectors in the loop-space normal
+        custom data layers of the corresponding loops
+
+        Parameters:
+            loops (seq<bmesh.types.BMLoop>): Loops of the cached BMesh
+            vn_local (numpy.ndarray<float>): (L, 3) array of normal vectors, or
+                                             a single vector shared by all loops
+        '''
+        loop_normal_x_layer = self.layers['loop-normal-x']
+        loop_normal_y_layer = self.layers['loop-normal-y']
+        loop_normal_z_layer = self.layers['loop-normal-z']
+        vn_loops = utils.loop_space_transform_batch(loops, vn_local)
+        for loop, (x, y, z) in zip(loops, vn_loops.tolist()):
+            loop[loop_normal_x_layer] = x
+            loop[loop_normal_y_layer] = y
+            loop[loop_normal_z_layer] = z
+
 
 class MESH_OT_ManageVertexNormalWeight(MESH_OT_YAVNEBase):
     bl_idname = 'mesh.yavne_manage_vertex_normal_weight'
@@ -107,11 +158,8 @@ class MESH_OT_ManageVertexNormalWeight(MESH_OT_YAVNEBase):
         edit_object = context.edit_object
         edit_object.update_from_editmode()
         mesh = edit_object.data
-        bm = bmesh.from_edit_mesh(mesh)
-        vertex_normal_weight_layer = bm.verts.layers.int['vertex-normal-weight']
-        loop_normal_x_layer = bm.loops.layers.float['loop-normal-x']
-        loop_normal_y_layer = bm.loops.layers.float['loop-normal-y']
-        loop_normal_z_layer = bm.loops.layers.float['loop-normal-z']
+        bm = self.get_bmesh(mesh)
+        vertex_normal_weight_layer = self.layers['vertex-normal-weight']
 
         # Determine enumerated vertex normal weight value.
         vertex_normal_weight = types.VertexNormalWeight[self.type].value
@@ -119,30 +167,34 @@ class MESH_OT_ManageVertexNormalWeight(MESH_OT_YAVNEBase):
         # Select vertices by given vertex normal weight.
         if self.action == 'GET':
             context.tool_settings.mesh_select_mode = (True, False, False)
-            for v in bm.verts:
-                if v[vertex_normal_weight_layer] == vertex_normal_weight:
-                    v.select = True
-                else:
-                    v.select = False
+            weights = utils.get_int_layer(
+                mesh.vertex_layers_int['vertex-normal-weight'])
+            bpy.ops.mesh.select_all(action = 'DESELECT')
+            bm.verts.ensure_lookup_table()
+            matches = np.flatnonzero(weights == vertex_normal_weight)
+            for i in matches.tolist():
+                bm.verts[i].select = True
             bm.select_mode = {'VERT'}
             bm.select_flush_mode()
 
         # Assign given vertex normal weight to selected vertices.
         elif self.action == 'SET':
-            selected_verts = [v for v in bm.verts if v.select]
+            bm.verts.ensure_lookup_table()
+            selected_verts = [
+                bm.verts[i]
+                for i in utils.get_selected_vert_indices(mesh).tolist()
+            ]
             for v in selected_verts:
                 v[vertex_normal_weight_layer] = vertex_normal_weight
 
             #  Set unweighted vertex normal component values.
             if self.type == 'UNWEIGHTED':
                 mesh.calc_normals_split()
-                for v in selected_verts:
-                    for loop in v.link_loops:
-                        vn_local = mesh.loops[loop.index].normal
-                        vn_loop = utils.loop_space_transform(loop, vn_local)
-                        loop[loop_normal_x_layer] = vn_loop.x
-                        loop[loop_normal_y_layer] = vn_loop.y
-                        loop[loop_normal_z_layer] = vn_loop.z
+                split_normals = utils.get_split_normals(mesh)
+                loops = [
+                    loop for v in selected_verts for loop in v.link_loops]
+                self.set_loop_normals(
+                    loops, split_normals[[loop.index for loop in loops]])
                 mesh.free_normals_split()
 
         # Update the mesh.
@@ -181,9 +233,11 @@ class MESH_OT_ManageFaceNormalInfluence(MESH_OT_YAVNEBase):
     )
 
     def execute(self, context):
-        mesh = bpy.context.edit_object.data
-        bm = bmesh.from_edit_mesh(mesh)
-        face_normal_influence_layer = bm.faces.layers.int['face-normal-influence']
+        edit_object = context.edit_object
+        edit_object.update_from_editmode()
+        mesh = edit_object.data
+        bm = self.get_bmesh(mesh)
+        face_normal_influence_layer = self.layers['face-normal-influence']
 
         # Determine enumerated face normal influence value.
         face_normal_influence = types.FaceNormalInfluence[self.type].value
@@ -191,17 +245,23 @@ class MESH_OT_ManageFaceNormalInfluence(MESH_OT_YAVNEBase):
         # Select faces by given normal vector influence.
         if self.action == 'GET':
             context.tool_settings.mesh_select_mode = (False, False, True)
-            for f in bm.faces:
-                if f[face_normal_influence_layer] == face_normal_influence:
-                    f.select = True
-                else:
-                    f.select = False
+            influences = utils.get_int_layer(
+                mesh.polygon_layers_int['face-normal-influence'])
+            bpy.ops.mesh.select_all(action = 'DESELECT')
+            bm.faces.ensure_lookup_table()
+            matches = np.flatnonzero(influences == face_normal_influence)
+            for i in matches.tolist():
+                bm.faces[i].select = True
             bm.select_mode = {'FACE'}
             bm.select_flush_mode()
 
         # Assign given face normal influence to selected faces.
         elif self.action == 'SET' and mesh.total_face_sel:
-            selected_faces = [f for f in bm.faces if f.select]
+            bm.faces.ensure_lookup_table()
+            selected_faces = [
+                bm.faces[i]
+                for i in utils.get_selected_face_indices(mesh).tolist()
+            ]
             for f in selected_faces:
                 f[face_normal_influence_layer] = face_normal_influence
 
@@ -228,24 +288,18 @@ class MESH_OT_PickShadingSource(MESH_OT_YAVNEBase):
         if self.initially_in_edit_mode:
             bpy.ops.object.mode_set(mode = 'OBJECT')
 
-        # Populate a list of objects that are valid as shading sources.
-        self.available_sources = [
-            obj
-            for obj in scene.objects
-            if (obj.type == 'MESH' and
-                obj is not edit_object and
-                not obj.hide_viewport
-            )
-        ]
-
-        # Hide objects that are visible but invalid as shading sources.
-        self.temporarily_hidden_objects = [
-            obj
-            for obj in scene.objects
-            if ((obj.type != 'MESH' and obj.visible_get()) or
-                obj is edit_object
-            )
-        ]
+        # Populate a list of objects that are valid as shading sources, and a
+        # list of objects that are visible but invalid as shading sources.
+        self.available_sources = []
+        self.temporarily_hidden_objects = []
+        for obj in scene.objects:
+            is_mesh = obj.type == 'MESH'
+            if obj is edit_object or (not is_mesh and obj.visible_get()):
+                self.temporarily_hidden_objects.append(obj)
+            elif is_mesh and not obj.hide_viewport:
+                self.available_sources.append(obj)
+
+        # Hide invalid objects.
         for obj in self.temporarily_hidden_objects:
             obj.hide_viewport = True
 
@@ -349,12 +403,14 @@ class MESH_OT_GetNormalVector(MESH_OT_YAVNEBase):
 
     def get_face_normal(self, context):
         edit_object = context.edit_object
+        edit_object.update_from_editmode()
         mesh = edit_object.data
         model_matrix = edit_object.matrix_world
-        bm = bmesh.from_edit_mesh(mesh)
+        bm = self.get_bmesh(mesh)
 
         # Determine which face is selected.
-        selected_face = [f for f in bm.faces if f.select][0]
+        bm.faces.ensure_lookup_table()
+        selected_face = bm.faces[int(utils.get_selected_face_indices(mesh)[0])]
 
         # Store selected face normal.
         vn_global = model_matrix @ selected_face.normal
@@ -368,19 +424,32 @@ class MESH_OT_GetNormalVector(MESH_OT_YAVNEBase):
         model_matrix = edit_object.matrix_world
         mesh = edit_object.data
         mesh.calc_normals_split()
-        bm = bmesh.from_edit_mesh(mesh)
+        bm = self.get_bmesh(mesh)
         overlay = context.space_data.overlay
 
         # Determine which vertex is selected.
-        selected_vert = [v for v in bm.verts if v.select][0]
+        bm.verts.ensure_lookup_table()
+        selected_vert = bm.verts[int(utils.get_selected_vert_indices(mesh)[0])]
         self.vertex_co = model_matrix @ selected_vert.co
 
-        # Gather world space normal vectors associated with selected vertex.
-        normals = set(
-            (model_matrix @ mesh.loops[loop.index].normal).to_tuple()
-            for loop in selected_vert.link_loops
+        # Gather world space normal vectors associated with selected vertex,
+        # discarding duplicates that only differ by floating-point noise.
+        split_normals = utils.get_split_normals(mesh)
+        loop_indices = [loop.index for loop in selected_vert.link_loops]
+        model_array = np.array(model_matrix)
+        normals = (
+            split_normals[loop_indices] @ model_array[:3, :3].T +
+            model_array[:3, 3]
         )
-        self.normals = list(normals)
+        unique_indices = np.unique(
+            np.round(normals * 1e4).astype(np.int64),
+            axis = 0,
+            return_index = True
+        )[1]
+        self.normals = [
+            tuple(vn_global)
+            for vn_global in normals[np.sort(unique_indices)].tolist()
+        ]
         self.selected_idx = 0
         self.num_normals = len(self.normals)
 
@@ -403,7 +472,9 @@ class MESH_OT_GetNormalVector(MESH_OT_YAVNEBase):
             self.saved_show_face_normals = overlay.show_face_normals
             overlay.show_face_normals = False
 
-            # Add render callback.
+            # Add render callback, whose batches are created on demand.
+            self.shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+            self.batches_key = None
             self.post_view_handle = bpy.types.SpaceView3D.draw_handler_add(
                 self.post_view_callback,
                 (context,),
@@ -448,38 +519,54 @@ class MESH_OT_GetNormalVector(MESH_OT_YAVNEBase):
         # Restore active area's header to its initial state.
         context.area.header_text_set(text = None)
 
+    def get_batches(self, normals_length):
+        '''
+        Gets GPU batches for drawing the normals of the selected vertex,
+        creating them only when the selection or normals length has changed
+
+        Parameters:
+            normals_length (float): Display length of normals
+
+        Returns:
+            (default, highlight): Batches of unselected and selected normals
+        '''
+        key = (self.selected_idx, normals_length)
+        if self.batches_key != key:
+            start = np.array(self.vertex_co, dtype = np.float32)
+            normals = np.array(self.normals, dtype = np.float32)
+            coords = np.empty((2 * self.num_normals, 3), dtype = np.float32)
+            coords[0::2] = start
+            coords[1::2] = start + normals * normals_length
+            highlighted = slice(2 * self.selected_idx, 2 * self.selected_idx + 2)
+            self.batches = (
+                gpu_extras.batch.batch_for_shader(
+                    self.shader, 'LINES',
+                    {'pos': np.delete(coords, highlighted, axis = 0)}),
+                gpu_extras.batch.batch_for_shader(
+                    self.shader, 'LINES',
+                    {'pos': coords[highlighted]})
+            )
+            self.batches_key = key
+        return self.batches
+
     def post_view_callback(self, context):
-        start = self.vertex_co
         normals_length = context.space_data.overlay.normals_length
         view_3d_theme = context.preferences.themes['Default'].view_3d
 
         default_color = (*view_3d_theme.split_normal, 1.0)
         highlight_color = (1.0, 1.0, 1.0, 1.0)
 
-        # Draw unselected normals of selected vertex.
-        coords = []
-        for idx in range(len(self.normals)):
-            if idx != self.selected_idx:
-                vn_global = self.normals[idx]
-                end = start + mathutils.Vector(vn_global) * normals_length
-                coords.append(start.to_tuple())
-                coords.append(end.to_tuple())
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        default_batch, highlight_batch = self.get_batches(normals_length)
+        shader = self.shader
         shader.bind()
+
+        # Draw unselected normals of selected vertex.
         shader.uniform_float('color', default_color)
-        batch = gpu_extras.batch.batch_for_shader(
-            shader, 'LINES', {'pos': coords})
-        batch.draw(shader)
+        default_batch.draw(shader)
 
         # Highlight selected normal.
-        end = start + mathutils.Vector(self.normals[self.selected_idx]) * normals_length
-        coords = [start.to_tuple(), end.to_tuple()]
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
         shader.uniform_float('color', highlight_color)
-        batch = gpu_extras.batch.batch_for_shader(
-            shader, 'LINES', {'pos': coords})
-        batch.draw(shader)
+        highlight_batch.draw(shader)
 
 
 class MESH_OT_SetNormalVector(MESH_OT_YAVNEBase):
@@ -497,23 +584,28 @@ class MESH_OT_SetNormalVector(MESH_OT_YAVNEBase):
 
     def execute(self, context):
         edit_object = context.edit_object
+        edit_object.update_from_editmode()
         mesh = edit_object.data
-        bm = bmesh.from_edit_mesh(mesh)
+        bm = self.get_bmesh(mesh)
         normal_buffer = self.addon.preferences.normal_buffer
-        vertex_normal_weight_layer = bm.verts.layers.int['vertex-normal-weight']
-        loop_normal_x_layer = bm.loops.layers.float['loop-normal-x']
-        loop_normal_y_layer = bm.loops.layers.float['loop-normal-y']
-        loop_normal_z_layer = bm.loops.layers.float['loop-normal-z']
+        vertex_normal_weight_layer = self.layers['vertex-normal-weight']
 
-        # Assign stored world space normal vector to all selected vertices.
+        # Transform the stored world space normal vector to object space once.
         vn_local = edit_object.matrix_world.inverted() @ normal_buffer
-        for v in [v for v in bm.verts if v.select]:
-            v[vertex_normal_weight_layer] = types.VertexNormalWeight.UNWEIGHTED.value
-            for loop in v.link_loops:
-                vn_loop = utils.loop_space_transform(loop, vn_local)
-                loop[loop_normal_x_layer] = vn_loop.x
-                loop[loop_normal_y_layer] = vn_loop.y
-                loop[loop_normal_z_layer] = vn_loop.z
+        unweighted = types.VertexNormalWeight.UNWEIGHTED.value
+
+        # Assign stored normal vector to all selected vertices.
+        bm.verts.ensure_lookup_table()
+        selected_verts = [
+            bm.verts[i]
+            for i in utils.get_selected_vert_indices(mesh).tolist()
+        ]
+        for v in selected_verts:
+            v[vertex_normal_weight_layer] = unweighted
+        self.set_loop_normals(
+            [loop for v in selected_verts for loop in v.link_loops],
+            np.array(vn_local)
+        )
 
         # Update the mesh.
         bpy.ops.mesh.yavne_update_vertex_normals()
@@ -553,94 +645,105 @@ class MESH_OT_MergeVertexNormals(MESH_OT_YAVNEBase):
         return (super().poll(context) and
                 mesh.total_vert_sel > 0)
 
+    def get_kdtree(self, coords, indices):
+        '''
+        Gets a spatial search tree of given vertices, reusing the tree built by
+        a previous execution (e.g. before a redo) if the same vertices are
+        located at the same coordinates
+
+        Parameters:
+            coords (numpy.ndarray<float>): (V, 3) array of vertex coordinates
+            indices (numpy.ndarray<int>): Indices of vertices to insert
+
+        Returns:
+            mathutils.kdtree.KDTree: Search tree keyed by vertex index
+        '''
+        key = getattr(self, 'kdtree_key', None)
+        if (key is None or
+            not np.array_equal(key[0], coords) or
+            not np.array_equal(key[1], indices)
+        ):
+            kd = mathutils.kdtree.KDTree(indices.size)
+            for i, co in zip(indices.tolist(), coords[indices].tolist()):
+                kd.insert(co, i)
+            kd.balance()
+            self.kdtree = kd
+            self.kdtree_key = (coords, indices)
+        return self.kdtree
+
     def execute(self, context):
         edit_object = context.edit_object
         edit_object.update_from_editmode()
         mesh = edit_object.data
-        bm = bmesh.from_edit_mesh(mesh)
-        vertex_normal_weight_layer = bm.verts.layers.int['vertex-normal-weight']
-        loop_normal_x_layer = bm.loops.layers.float['loop-normal-x']
-        loop_normal_y_layer = bm.loops.layers.float['loop-normal-y']
-        loop_normal_z_layer = bm.loops.layers.float['loop-normal-z']
-        merge_distance_squared = self.distance ** 2
-
-        # Organize vertices into discrete space.
-        cells = {}
-        selected_verts = set(v for v in bm.verts if v.select)
-        for v in (bm.verts if self.unselected else selected_verts):
-            v_co = v.co
-            x = v_co.x // self.distance
-            y = v_co.y // self.distance
-            z = v_co.z // self.distance
-
-            # Ensure that the cell exists.
-            if not x in cells:
-                cells[x] = {}
-            if not y in cells[x]:
-                cells[x][y] = {}
-            if not z in cells[x][y]:
-                cells[x][y][z] = []
-
-            # Add vertex reference to the cell.
-            cells[x][y][z].append(v)
+        bm = self.get_bmesh(mesh)
+        vertex_normal_weight_layer = self.layers['vertex-normal-weight']
+        unweighted = types.VertexNormalWeight.UNWEIGHTED.value
+
+        # Organize vertices into a spatial search tree, keyed by vertex index.
+        bm.verts.ensure_lookup_table()
+        selected_indices = utils.get_selected_vert_indices(mesh)
+        coords = utils.get_vert_coords(mesh)
+        if self.unselected:
+            candidate_indices = np.arange(len(coords))
+        else:
+            candidate_indices = selected_indices
+        kd = self.get_kdtree(coords, candidate_indices)
 
         # Merge vertex normals in the vicinity of each selected vertex.
         mesh.calc_normals_split()
-        while selected_verts:
-            v_curr = selected_verts.pop()
-            v_curr_co = v_curr.co
-            v_curr_normal_count = len(set(
-                mesh.loops[loop.index].normal.to_tuple()
-                for loop in v_curr.link_loops
+        split_normals = utils.get_split_normals(mesh)
+        vert_loop_starts, vert_loops = utils.get_vert_loops(mesh)
+        remaining = np.zeros(len(coords), dtype = bool)
+        remaining[selected_indices] = True
+        merged_normals = {}
+        while remaining.any():
+            i_curr = int(np.argmax(remaining))
+            v_curr = bm.verts[i_curr]
+            v_curr_normal_count = len(np.unique(
+                split_normals[vert_loops[
+                    vert_loop_starts[i_curr]:vert_loop_starts[i_curr + 1]]],
+                axis = 0
             ))
-            x = v_curr_co.x // self.distance
-            y = v_curr_co.y // self.distance
-            z = v_curr_co.z // self.distance
-
-            # Search adjacent cells for vertices.
-            nearby_verts = []
-            for i in [x - 1, x, x + 1]:
-                for j in [y - 1, y, y + 1]:
-                    for k in [z - 1, z, z + 1]:
-
-                        # Add contents of current cell to search results.
-                        if i in cells and j in cells[i] and k in cells[i][j]:
-                            nearby_verts.extend(cells[i][j][k])
-
-            # Exclude vertices that are outside of given merge distance.
-            mergeable_verts = [
-                v
-                for v in nearby_verts
-                if (v.co - v_curr_co).length_squared <= merge_distance_squared
-            ]
-
-            # Calculate merged normal.
-            vn_local = mathutils.Vector()
-            for v in mergeable_verts:
-
-                # Average normals of current vertex.
-                vn = mathutils.Vector()
-                for loop in v.link_loops:
-                    vn += mesh.loops[loop.index].normal
-                vn.normalize()
 
-                # Include current, averaged vertex normal in merged normal.
-                vn_local += vn
+            # Find vertices within given merge distance.
+            mergeable_indices = [
+                i for (co, i, dist) in kd.find_range(v_curr.co, self.distance)
+            ]
+            mergeable_verts = [bm.verts[i] for i in mergeable_indices]
+
+            # Calculate merged normal by averaging the normals of each
+            # mergeable vertex, and then averaging those vertex normals. Loose
+            # vertices have no loops to contribute.
+            mergeable = np.array(mergeable_indices, dtype = np.int64)
+            starts = vert_loop_starts[mergeable]
+            counts = vert_loop_starts[mergeable + 1] - starts
+            starts = starts[counts > 0]
+            counts = counts[counts > 0]
+            offsets = np.cumsum(counts) - counts
+            loops = vert_loops[
+                np.arange(counts.sum()) + np.repeat(starts - offsets, counts)]
+            vn_verts = utils.normalize_rows(
+                np.add.reduceat(split_normals[loops], offsets, axis = 0))
+            vn_local = mathutils.Vector(vn_verts.sum(axis = 0))
             vn_local.normalize()
 
             # Assign merged normal to all vertices within given merge distance.
             if v_curr_normal_count > 1 or len(mergeable_verts) > 1:
                 for v in mergeable_verts:
-                    v[vertex_normal_weight_layer] = types.VertexNormalWeight.UNWEIGHTED.value
+                    v[vertex_normal_weight_layer] = unweighted
                     for loop in v.link_loops:
-                        vn_loop = utils.loop_space_transform(loop, vn_local)
-                        loop[loop_normal_x_layer] = vn_loop.x
-                        loop[loop_normal_y_layer] = vn_loop.y
-                        loop[loop_normal_z_layer] = vn_loop.z
+                        merged_normals[loop] = vn_local
 
             # Indicate which selected vertices have been merged.
-            local_selection = [v for v in mergeable_verts if v.select]
-            selected_verts.difference_update(local_selection)
+            remaining[mergeable_indices] = False
+            remaining[i_curr] = False
+
+        # Store merged normals in loop space all at once.
+        if merged_normals:
+            self.set_loop_normals(
+                list(merged_normals.keys()),
+                np.array([tuple(vn) for vn in merged_normals.values()])
+            )
 
         # Update the mesh.
         bpy.ops.mesh.yavne_update_vertex_normals()
@@ -672,7 +775,8 @@ class MESH_OT_TransferShading(MESH_OT_YAVNEBase):
     def execute(self, context):
         edit_object = context.edit_object
         mesh = edit_object.data
-        mesh.use_auto_smooth = True
+        if not mesh.use_auto_smooth:
+            mesh.use_auto_smooth = True
         modifiers = edit_object.modifiers
         source = self.addon.preferences.source
 
@@ -680,7 +784,7 @@ class MESH_OT_TransferShading(MESH_OT_YAVNEBase):
         bpy.ops.object.mode_set(mode = 'OBJECT')
 
         # Group selected vertices.
-        selected_vertices = [v.index for v in mesh.vertices if v.select]
+        selected_vertices = utils.get_selected_vert_indices(mesh).tolist()
         selected_vertices_group = edit_object.vertex_groups.new(name = 'Selected')
         selected_vertices_group.add(selected_vertices, 1, 'ADD')
 
@@ -692,8 +796,8 @@ class MESH_OT_TransferShading(MESH_OT_YAVNEBase):
         data_xfer_modifier.loop_mapping = 'POLYINTERP_NEAREST'
 
         # Move data transfer modifier to the top of the stack.
-        while modifiers[0] != data_xfer_modifier:
-            bpy.ops.object.modifier_move_up(modifier = data_xfer_modifier.name)
+        bpy.ops.object.modifier_move_to_index(
+            modifier = data_xfer_modifier.name, index = 0)
 
         # Apply data transfer modifier.
         bpy.ops.object.modifier_apply(modifier = data_xfer_modifier.name)
@@ -723,110 +827,123 @@ class MESH_OT_UpdateVertexNormals(MESH_OT_YAVNEBase):
     )
     bl_options = set()
 
-    def __init__(self):
-        super().__init__()
-        self.procs = []
-
-    def __del__(self):
-        if hasattr(super(), '__del__'):
-            super().__del__()
-
-        # Cleanup any lingering processes.
-        if hasattr(self, 'procs'):
-            for p in self.procs:
-                p.terminate()
-
-    def worker(self, bm, out, chunk, total):
+    def calc_split_normals(self, mesh):
         '''
-        Calculates a chunk of split normals data
+        Calculates split normals data
 
         Parameters:
-            bm (bmesh.types.BMesh): BMesh data
-            out (Array<Vec3>): Output sequence of split normals as ctype structs
-            chunk (int): Chunk of data to process in range [0, total)
-            total (int): Total number of chunks
-
-        Pre:
-            Output sequence shall be large enough to accommodate all split
-            normals with given chunk of data.
+            mesh (bpy.types.Mesh): Mesh data
 
-        Post:
-            Output sequence is modified.
+        Returns:
+            numpy.ndarray<float>: (L, 3) array of split normals in loop order
         '''
-        face_normal_influence_layer = bm.faces.layers.int['face-normal-influence']
-        vertex_normal_weight_layer = bm.verts.layers.int['vertex-normal-weight']
-        loop_normal_x_layer = bm.loops.layers.float['loop-normal-x']
-        loop_normal_y_layer = bm.loops.layers.float['loop-normal-y']
-        loop_normal_z_layer = bm.loops.layers.float['loop-normal-z']
-
-        # Create a cache for face areas.
-        if self.addon.preferences.use_linked_face_weights:
-            area_cache = types.LinkedFaceAreaCache(self.addon.preferences.link_angle)
-        else:
-            area_cache = types.FaceAreaCache()
+        preferences = self.addon.preferences
+        unweighted = types.VertexNormalWeight.UNWEIGHTED.value
 
         # Determine the auto smooth angle.
-        if self.addon.preferences.use_auto_smooth:
-            smooth_angle = self.addon.preferences.smooth_angle
+        if preferences.use_auto_smooth:
+            smooth_angle = preferences.smooth_angle
         else:
             smooth_angle = math.pi
 
-        # Determine which vertices are within the chunk of data.
-        first = int(chunk / total * len(bm.verts))
-        last = int((chunk + 1) / total * len(bm.verts))
-
-        # Calculate loop normals.
-        for idx in [i + first for i in range(last - first)]:
-            v = bm.verts[idx]
-            vertex_normal_weight = v[vertex_normal_weight_layer]
-
-            # Split vertex linked loops into shading groups.
-            for loop_group in utils.split_loops(
-                v, smooth_angle, self.addon.preferences.use_flat_faces):
-
-                # Determine which face type most influences this vertex.
-                influence_max = max((
-                    loop.face[face_normal_influence_layer]
-                    for loop in loop_group
-                ))
-
-                # Ignore all but the most influential face normals.
-                loop_subgroup = [
-                    loop
-                    for loop in loop_group
-                    if loop.face[face_normal_influence_layer] == influence_max
-                ]
-
-                # Average face normals according to vertex normal weight.
-                vn_local = mathutils.Vector()
-                if vertex_normal_weight == types.VertexNormalWeight.UNIFORM.value:
-                    for loop in loop_subgroup:
-                        vn_local += loop.face.normal
-                elif vertex_normal_weight == types.VertexNormalWeight.ANGLE.value:
-                    for loop in loop_subgroup:
-                        vn_local += loop.calc_angle() * loop.face.normal
-                elif vertex_normal_weight == types.VertexNormalWeight.AREA.value:
-                    for loop in loop_subgroup:
-                        area = area_cache.get(loop.face)
-                        vn_local +=  area * loop.face.normal
-                elif vertex_normal_weight == types.VertexNormalWeight.COMBINED.value:
-                    for loop in loop_subgroup:
-                        area = area_cache.get(loop.face)
-                        vn_local += loop.calc_angle() * area * loop.face.normal
-                elif vertex_normal_weight == types.VertexNormalWeight.UNWEIGHTED.value:
-                    for loop in loop_subgroup:
-                        vn_loop = mathutils.Vector((
-                            loop[loop_normal_x_layer],
-                            loop[loop_normal_y_layer],
-                            loop[loop_normal_z_layer]
-                        ))
-                        vn_local += utils.loop_space_transform(loop, vn_loop, True)
-
-                # Assign calculated vertex normal to all loops in the group.
-                vn_local.normalize()
-                for loop in loop_group:
-                    split_normal = out[loop.index]
-                    split_normal.x, split_normal.y, split_normal.z = vn_local
+        # Read integer custom data layers in bulk from the mesh.
+        vertex_normal_weights = utils.get_int_layer(
+            mesh.vertex_layers_int['vertex-normal-weight'])
+        face_normal_influences = utils.get_int_layer(
+            mesh.polygon_layers_int['face-normal-influence'])
+
+        # Determine which edges are smooth once for all vertices.
+        loop_faces, prev_loops, next_loops = utils.get_loop_topology(mesh)
+        loop_pairs = utils.get_contiguous_loop_pairs(mesh)
+        face_normals = np.empty((len(mesh.polygons), 3), dtype = np.float64)
+        mesh.polygons.foreach_get('normal', face_normals.ravel())
+        smooth_edges = utils.calc_smooth_edges(
+            mesh, loop_pairs, loop_faces, face_normals, smooth_angle,
+            preferences.use_flat_faces)
+
+        # Split vertex linked loops into shading groups.
+        split_normals = np.zeros((len(mesh.loops), 3), dtype = np.float64)
+        loop_indices, group_starts, group_verts = utils.group_loops(
+            mesh, loop_pairs, smooth_edges, next_loops)
+        if not loop_indices.size:
+            return split_normals
+        group_weights = vertex_normal_weights[group_verts]
+        group_indices = np.repeat(
+            np.arange(group_starts.size),
+            np.diff(group_starts, append = loop_indices.size)
+        )
+        loop_weights = group_weights[group_indices]
+
+        # Gather face data of each grouped loop.
+        faces = loop_faces[loop_indices]
+        influences = face_normal_influences[faces]
+
+        # Ignore all but the most influential face normals of each group.
+        influence_max = np.maximum.reduceat(influences, group_starts)
+        mask = influences == influence_max[group_indices]
+
+        # Weight face normals according to vertex normal weight.
+        weights = np.ones(loop_indices.size)
+        angle = types.VertexNormalWeight.ANGLE.value
+        area = types.VertexNormalWeight.AREA.value
+        combined = types.VertexNormalWeight.COMBINED.value
+        uses_angle = (loop_weights == angle) | (loop_weights == combined)
+        uses_area = (loop_weights == area) | (loop_weights == combined)
+        if uses_angle.any():
+            angles = utils.calc_loop_angles(mesh, prev_loops, next_loops)
+            weights[uses_angle] *= angles[loop_indices[uses_angle]]
+        if uses_area.any():
+            face_areas = np.empty(len(mesh.polygons), dtype = np.float64)
+            mesh.polygons.foreach_get('area', face_areas)
+            if preferences.use_linked_face_weights:
+                face_areas = utils.calc_linked_face_areas(
+                    loop_pairs, loop_faces, face_normals, face_areas,
+                    preferences.link_angle)
+            weights[uses_area] *= face_areas[faces[uses_area]]
+        weights *= mask
+        contributions = weights[:, None] * face_normals[faces]
+
+        # Unweighted normals are stored in loop space, and only loops that
+        # survived the influence filter need to be transformed. Loop float
+        # layers are only accessible through BMesh data, so it is loaded just
+        # for this purpose.
+        unweighted_rows = np.flatnonzero((loop_weights == unweighted) & mask)
+        if unweighted_rows.size:
+            bm = bmesh.new()
+            bm.from_mesh(mesh)
+            loop_normal_x_layer = bm.loops.layers.float['loop-normal-x']
+            loop_normal_y_layer = bm.loops.layers.float['loop-normal-y']
+            loop_normal_z_layer = bm.loops.layers.float['loop-normal-z']
+            face_loop_starts = np.empty(len(mesh.polygons), dtype = np.int64)
+            mesh.polygons.foreach_get('loop_start', face_loop_starts)
+            unweighted_faces = faces[unweighted_rows]
+            unweighted_corners = (
+                loop_indices[unweighted_rows] -
+                face_loop_starts[unweighted_faces]
+            )
+            bm.faces.ensure_lookup_table()
+            unweighted_loops = [
+                bm.faces[f].loops[c]
+                for f, c in zip(unweighted_faces.tolist(),
+                                unweighted_corners.tolist())
+            ]
+            vn_loops = np.array([
+                (loop[loop_normal_x_layer],
+                 loop[loop_normal_y_layer],
+                 loop[loop_normal_z_layer])
+                for loop in unweighted_loops
+            ])
+            contributions[unweighted_rows] = utils.loop_space_transform_batch(
+                unweighted_loops, vn_loops, True)
+            bm.free()
+
+        # Average face normals of each group, and assign the calculated vertex
+        # normal to all loops in the group.
+        vn_local = np.add.reduceat(contributions, group_starts, axis = 0)
+        utils.normalize_rows(vn_local)
+        split_normals[loop_indices] = vn_local[group_indices]
+
+        return split_normals
 
     def execute(self, context):
         mesh = context.edit_object.data
@@ -835,50 +952,21 @@ class MESH_OT_UpdateVertexNormals(MESH_OT_YAVNEBase):
         # Split normal data can only be written from Object mode.
         bpy.ops.object.mode_set(mode = 'OBJECT')
 
-        # Initialize BMesh.
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
-
         # Enable mesh/overlay flags.
-        mesh.use_auto_smooth = True
-        overlay.show_edge_sharp = True
+        if not mesh.use_auto_smooth:
+            mesh.use_auto_smooth = True
+        if not overlay.show_edge_sharp:
+            overlay.show_edge_sharp = True
 
-        # Prepare the mesh to be processed.
+        # Calculate split normals.
         mesh.calc_normals_split()
-        bm.verts.ensure_lookup_table()
-        split_normals = multiprocessing.sharedctypes.Array(
-            types.Vec3, len(mesh.loops), lock = False)
-
-        # Execute in parallel for large datasets if supported by the system.
-        if len(bm.verts) > 5000 and os.name not in {'nt', 'posix'}:
-
-            # Create a team of worker processes.
-            num_procs = utils.get_num_procs()
-            for i in range(num_procs):
-                self.procs.append(multiprocessing.Process(
-                    target = self.worker,
-                    args = (bm, split_normals, i, num_procs)
-                ))
-
-            # Start processes.
-            for p in self.procs:
-                p.start()
-
-            # Wait until all processes have finished.
-            while len(self.procs) > 0:
-                p = self.procs.pop()
-                p.join()
-
-        # Otherwise, execute serially.
-        else:
-            self.worker(bm, split_normals, 0, 1)
+        split_normals = self.calc_split_normals(mesh)
 
         # Write split normal data to the mesh, and return to Edit mode.
-        mesh.normals_split_custom_set([(n.x, n.y, n.z) for n in split_normals])
+        mesh.normals_split_custom_set(split_normals.tolist())
         bpy.ops.object.mode_set(mode = 'EDIT')
 
         # Cleanup.
         mesh.free_normals_split()
-        bm.free()
 
         return {'FINISHED'}
@@ -31,6 +31,29 @@ class MESH_PT_YAVNEPanel(bpy.types.Panel):
     def poll(cls, context):
         return context.mode == 'EDIT_MESH'
 
+    @classmethod
+    def register(cls):
+        handlers = bpy.app.handlers.depsgraph_update_post
+        if update_available_sources not in handlers:
+            handlers.append(update_available_sources)
+
+        # Generate the collection once registration has finished rather than
+        # waiting for the first dependency graph update. The timer must be
+        # persistent to survive loading a file before it fires.
+        bpy.app.timers.register(
+            init_available_sources,
+            first_interval = 0.0,
+            persistent = True
+        )
+
+    @classmethod
+    def unregister(cls):
+        if bpy.app.timers.is_registered(init_available_sources):
+            bpy.app.timers.unregister(init_available_sources)
+        handlers = bpy.app.handlers.depsgraph_update_post
+        if update_available_sources in handlers:
+            handlers.remove(update_available_sources)
+
     def draw(self, context):
         addon = context.preferences.addons[self.addon_key]
         self.addon_props = addon.preferences
@@ -77,6 +100,7 @@ class MESH_PT_YAVNEPanel(bpy.types.Panel):
 
     def draw_vertex_normal_weight_ui(self, context, layout):
         addon_props = self.addon_props
+        vertex_normal_weight = addon_props.vertex_normal_weight
 
         col = layout.column(align = True)
 
@@ -88,15 +112,16 @@ class MESH_PT_YAVNEPanel(bpy.types.Panel):
 
         op = row.operator('mesh.yavne_manage_vertex_normal_weight', text = '', icon = 'VERTEXSEL')
         op.action = 'GET'
-        op.type = addon_props.vertex_normal_weight
+        op.type = vertex_normal_weight
 
         op = row.operator('mesh.yavne_manage_vertex_normal_weight', text = '', icon = 'ADD')
         op.action = 'SET'
-        op.type = addon_props.vertex_normal_weight
+        op.type = vertex_normal_weight
         op.update = True
 
     def draw_face_normal_influence_ui(self, context, layout):
         addon_props = self.addon_props
+        face_normal_influence = addon_props.face_normal_influence
 
         col = layout.column(align = True)
 
@@ -109,11 +134,11 @@ class MESH_PT_YAVNEPanel(bpy.types.Panel):
 
         op = row.operator('mesh.yavne_manage_face_normal_influence', text = '', icon = 'FACESEL')
         op.action = 'GET'
-        op.type = addon_props.face_normal_influence
+        op.type = face_normal_influence
 
         op = row.operator('mesh.yavne_manage_face_normal_influence', text = '', icon = 'ADD')
         op.action = 'SET'
-        op.type = addon_props.face_normal_influence
+        op.type = face_normal_influence
         op.update = True
 
     def draw_edit_vertex_normals_ui(self, context, layout):
@@ -142,24 +167,9 @@ class MESH_PT_YAVNEPanel(bpy.types.Panel):
 
     def draw_transfer_shading_ui(self, context, layout):
         addon_props = self.addon_props
-        edit_object = context.edit_object
 
         col = layout.column(align = True)
 
-        # Generate a collection of potential shading sources.
-        available_sources = addon_props.available_sources
-        available_sources.clear()
-        for obj in context.scene.objects:
-            if obj.type == 'MESH' and obj != edit_object:
-                item = available_sources.add()
-                item.name = obj.name
-
-        # Confirm that the current shading source is still available.
-        if (addon_props.source and
-            addon_props.source not in addon_props.available_sources
-        ):
-            addon_props.source = ''
-
         col.operator('mesh.yavne_transfer_shading')
 
         row = col.row(align = True)
@@ -201,3 +211,93 @@ class MESH_PT_YAVNEPanel(bpy.types.Panel):
             row.active = addon_props.use_auto_smooth
 
             box.prop(addon_props, 'use_flat_faces')
+
+
+# Update flags (transform, geometry, shading) of object updates that cannot
+# change which objects are potential shading sources
+_PASSIVE_UPDATE_FLAGS = {(True, False, False), (False, True, False)}
+
+# Object count and edit object name at the last regeneration of the collection
+_sources_state = None
+
+
+def refresh_available_sources(scene):
+    '''
+    Regenerates the collection of potential shading sources, but only if the
+    set of candidate objects has changed since it was last generated
+
+    Parameters:
+        scene (bpy.types.Scene): Scene whose objects are candidates
+    '''
+    addon = bpy.context.preferences.addons.get(MESH_PT_YAVNEPanel.addon_key)
+    if not addon:
+        return
+    addon_props = addon.preferences
+    edit_object = bpy.context.edit_object
+
+    # Record the state that update_available_sources() compares against.
+    global _sources_state
+    _sources_state = (
+        len(scene.objects), edit_object.name if edit_object else '')
+
+    # Determine which objects are potential shading sources.
+    names = [
+        obj.name
+        for obj in scene.objects
+        if obj.type == 'MESH' and obj != edit_object
+    ]
+    available_sources = addon_props.available_sources
+    if names == [item.name for item in available_sources]:
+        return
+
+    # Generate a collection of potential shading sources.
+    available_sources.clear()
+    for name in names:
+        item = available_sources.add()
+        item.name = name
+
+    # Confirm that the current shading source is still available.
+    if addon_props.source and addon_props.source not in available_sources:
+        addon_props.source = ''
+
+
+def init_available_sources():
+    '''
+    Generates the initial collection of potential shading sources
+
+    Returns:
+        None: Do not repeat this timer.
+    '''
+    scene = bpy.context.scene
+    if scene:
+        refresh_available_sources(scene)
+    return None
+
+
+@bpy.app.handlers.persistent
+def update_available_sources(scene, depsgraph = None):
+    '''
+    Regenerates the collection of potential shading sources after dependency
+    graph updates that may change the set of candidate objects
+
+    Parameters:
+        scene (bpy.types.Scene): Updated scene
+        depsgraph (bpy.types.Depsgraph): Evaluated dependency graph
+    '''
+    # Most updates, such as transforms and mesh edits, cannot change the set of
+    # candidate objects. Skip them without reading every object's name, unless
+    # objects were added or removed, Edit mode was entered or left, or an
+    # object changed in some other way, such as being renamed.
+    if depsgraph is not None:
+        edit_object = bpy.context.edit_object
+        state = (len(scene.objects), edit_object.name if edit_object else '')
+        if state == _sources_state and not any(
+            isinstance(update.id, bpy.types.Object) and (
+                update.is_updated_transform,
+                update.is_updated_geometry,
+                update.is_updated_shading
+            ) not in _PASSIVE_UPDATE_FLAGS
+            for update in depsgraph.updates
+        ):
+            return
+    refresh_available_sources(scene)
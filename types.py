@@ -16,20 +16,7 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-import ctypes
 import enum
-from . import utils
-
-
-class Vec3(ctypes.Structure):
-    '''
-    Represents a 3-dimensional vector as a ctype struct
-    '''
-    _fields_ = [
-        ('x', ctypes.c_double),
-        ('y', ctypes.c_double),
-        ('z', ctypes.c_double)
-    ]
 
 
 @enum.unique
@@ -54,34 +41,38 @@ class FaceNormalInfluence(enum.Enum):
                 'calculations'
             ),
             default = 'MEDIUM',
-            items = [(
-                    'WEAK',
-                    'Weak', (
-                        'Face normal participates only if a vertex is not '   +
-                        'influenced by either a medium or strong face.'
-                    ),
-                    '',
-                    cls.WEAK.value
-                ), (
-                    'MEDIUM',
-                    'Medium', (
-                        'Face normal participates only if a vertex is not '   +
-                        'influenced by a strong face.'
-                    ),
-                    '',
-                    cls.MEDIUM.value
-                ), (
-                    'STRONG',
-                    'Strong', (
-                        'Face normal always participates.'
-                    ),
-                    '',
-                    cls.STRONG.value
-                )
-            ]
+            items = FACE_NORMAL_INFLUENCE_ITEMS
         )
 
 
+# Items of the enum property representation of FaceNormalInfluence, in UI order
+FACE_NORMAL_INFLUENCE_ITEMS = ((
+        'WEAK',
+        'Weak', (
+            'Face normal participates only if a vertex is not '   +
+            'influenced by either a medium or strong face.'
+        ),
+        '',
+        FaceNormalInfluence.WEAK.value
+    ), (
+        'MEDIUM',
+        'Medium', (
+            'Face normal participates only if a vertex is not '   +
+            'influenced by a strong face.'
+        ),
+        '',
+        FaceNormalInfluence.MEDIUM.value
+    ), (
+        'STRONG',
+        'Strong', (
+            'Face normal always participates.'
+        ),
+        '',
+        FaceNormalInfluence.STRONG.value
+    )
+)
+
+
 @enum.unique
 class VertexNormalWeight(enum.Enum):
     '''
@@ -106,136 +97,50 @@ class VertexNormalWeight(enum.Enum):
                 'weighted average of adjacent face normals'
             ),
             default = 'ANGLE',
-            items = [(
-                    'UNIFORM',
-                    'Uniform', (
-                        'Face normals are averaged evenly.'
-                    ),
-                    '',
-                    cls.UNIFORM.value
-                ), (
-                    'ANGLE',
-                    'Corner Angle', (
-                        'Face normals are averaged according to the corner '  +
-                        'angle of a shared vertex in each face. This is the ' +
-                        'smooth shading approach used by Blender.'
-                    ),
-                    '',
-                    cls.ANGLE.value
-                ), (
-                    'AREA',
-                    'Face Area', (
-                        'Face normals are averaged according to the area of ' +
-                        'each face.'
-                    ),
-                    '',
-                    cls.AREA.value
-                ), (
-                    'COMBINED',
-                    'Combined', (
-                        'Face normals are averaged according to both corner ' +
-                        'angle and face area.'
-                    ),
-                    '',
-                    cls.COMBINED.value
-                ), (
-                    'UNWEIGHTED',
-                    'Unweighted', (
-                        'Face normals are not averaged; vertex normals are '  +
-                        'fixed.'
-                    ),
-                    '',
-                    cls.UNWEIGHTED.value
-                )
-            ]
+            items = VERTEX_NORMAL_WEIGHT_ITEMS
         )
 
 
-class Cache():
-    '''
-    Data structure for caching values
-
-    Attributes:
-        _cache (dict<tuple, Any>): Cached values
-    '''
-
-    def __init__(self, *args, **kwargs):
-        '''
-        Initializes this cache
-        '''
-        self._cache = dict()
-
-    def get(self, *args, **kwargs):
-        '''
-        Gets cached value or calculates a value if not already cached
-
-        Returns:
-            Any: Cached value
-        '''
-        if args not in self._cache:
-            self._cache[args] = self._calc(*args, **kwargs)
-        return self._cache[args]
-
-    def _calc(self, *args, **kwargs):
-        '''
-        Abstract method to calculate a value
-
-        Raises: NotImplementedError
-        '''
-        raise NotImplementedError
-
-
-class FaceAreaCache(Cache):
-    '''
-    Data structure for caching face areas
-    '''
-
-    def _calc(self, face, *args, **kwargs):
-        '''
-        Calculates area of given face
-
-        Parameters:
-            face (bmesh.types.BMFace): Face for which to calculate the area
-
-        Returns:
-            float: Face area
-        '''
-        return face.calc_area()
-
-
-class LinkedFaceAreaCache(Cache):
-    '''
-    Data structure for caching linked face areas
-
-    Attributes:
-        _angle (float): Edge angle threshold in radians
-    '''
-
-    def __init__(self, angle = 0.0, *args, **kwargs):
-        '''
-        Initializes this linked face area cache
-
-        Parameters:
-            angle (float): Edge angle threshold in radians
-        '''
-        super().__init__(angle, *args, **kwargs)
-        self._angle = angle
-
-    def _calc(self, face, *args, **kwargs):
-        '''
-        Calculates linked face area of given face
-
-        Parameters:
-            face (bmesh.types.BMFace): Face for which to calculate linked face area
-
-        Post:
-            Area values are cached for all faces linked to given face.
-
-        Returns:
-            float: Linked face area
-        '''
-        linked_faces = utils.get_linked_faces(face, self._angle)
-        linked_face_area = sum(f.calc_area() for f in linked_faces)
-        for f in linked_faces:
-            self._cache[(f, *args)] = linked_face_area
-        return linked_face_area
+# Items of the enum property representation of VertexNormalWeight, in UI order
+VERTEX_NORMAL_WEIGHT_ITEMS = ((
+        'UNIFORM',
+        'Uniform', (
+            'Face normals are averaged evenly.'
+        ),
+        '',
+        VertexNormalWeight.UNIFORM.value
+    ), (
+        'ANGLE',
+        'Corner Angle', (
+            'Face normals are averaged according to the corner '  +
+            'angle of a shared vertex in each face. This is the ' +
+            'smooth shading approach used by Blender.'
+        ),
+        '',
+        VertexNormalWeight.ANGLE.value
+    ), (
+        'AREA',
+        'Face Area', (
+            'Face normals are averaged according to the area of ' +
+            'each face.'
+        ),
+        '',
+        VertexNormalWeight.AREA.value
+    ), (
+        'COMBINED',
+        'Combined', (
+            'Face normals are averaged according to both corner ' +
+            'angle and face area.'
+        ),
+        '',
+        VertexNormalWeight.COMBINED.value
+    ), (
+        'UNWEIGHTED',
+        'Unweighted', (
+            'Face normals are not averaged; vertex normals are '  +
+            'fixed.'
+        ),
+        '',
+        VertexNormalWeight.UNWEIGHTED.value
+    )
+)
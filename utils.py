@@ -19,6 +19,7 @@ import bpy
 import bmesh
 import math
 import mathutils
+import numpy as np
 import sys
 from bpy_extras.view3d_utils import (
     region_2d_to_location_3d,
@@ -27,64 +28,88 @@ from bpy_extras.view3d_utils import (
 )
 
 
-def split_loops(vert, angle = math.pi, use_flat_faces = False):
+def calc_smooth_edges(mesh, loop_pairs, faces, face_normals,
+                      angle = math.pi, use_flat_faces = False):
     '''
-    Splits vertex linked loops into groups based on edge properties
+    Determines which edges loops may be grouped across for smooth shading
 
     Parameters:
-        vert (bmesh.types.BMVert): Common vertex shared by loops
-        angle (float):             Face edge angle threshold in radians
-        use_flat_faces (bool):     Flag controlling if vertex normals are split
-                                   along flat shaded face boundaries
+        mesh (bpy.types.Mesh): Mesh data
+        loop_pairs (tuple): Result of get_contiguous_loop_pairs()
+        faces (numpy.ndarray<int>): Polygon that contains each loop
+        face_normals (numpy.ndarray<float>): (F, 3) array of face normals
+        angle (float): Face edge angle threshold in radians
+        use_flat_faces (bool): Flag controlling if vertex normals are split
+                               along flat shaded face boundaries
 
     Returns:
-        list<list<bmesh.types.BMLoop>>: Grouped loops
-    '''
-    loop_groups = []
-
-    # Split vertex linked loops into groups.
-    link_loops = set(loop for loop in vert.link_loops)
-    while len(link_loops) > 0:
-
-        # Transfer a loop to a subgroup.
-        loop_subgroup = [link_loops.pop()]
-        loop_groups.append(loop_subgroup)
-
-        # Find grouped loops in the forward direction.
-        loop_curr = loop_subgroup[0]
-        loop_next = loop_subgroup[0].link_loop_radial_next.link_loop_next
-        while (
-            loop_next in link_loops and
-            loop_curr.edge.is_manifold and
-            is_edge_smooth(loop_curr.edge, use_flat_faces) and
-            loop_curr.edge.calc_face_angle() <= angle
-        ):
-            # Transfer next loop to the subgroup.
-            link_loops.remove(loop_next)
-            loop_subgroup.append(loop_next)
-
-            # Advance to the next pair of loops.
-            loop_curr = loop_next
-            loop_next = loop_curr.link_loop_radial_next.link_loop_next
-
-        # Find grouped loops in the reverse direction.
-        loop_curr = loop_subgroup[0]
-        loop_prev = loop_subgroup[0].link_loop_prev.link_loop_radial_prev
-        while (
-            loop_prev in link_loops and
-            loop_prev.edge.is_manifold and
-            is_edge_smooth(loop_prev.edge, use_flat_faces) and
-            loop_prev.edge.calc_face_angle() <= angle
-        ):
-            # Transfer previous loop to the subgroup.
-            link_loops.remove(loop_prev)
-            loop_subgroup.append(loop_prev)
+        numpy.ndarray<bool>: Flag for each smooth, contiguous edge, indexed by
+                             edge index
+    '''
+    edges, loops_a, loops_b = loop_pairs
+    edge_sharp = np.empty(len(mesh.edges), dtype = bool)
+    mesh.edges.foreach_get('use_edge_sharp', edge_sharp)
+
+    # Exclude sharp edges, and optionally the boundaries of flat faces.
+    faces_a = faces[loops_a]
+    faces_b = faces[loops_b]
+    smooth = ~edge_sharp[edges]
+    if use_flat_faces:
+        face_smooth = np.empty(len(mesh.polygons), dtype = bool)
+        mesh.polygons.foreach_get('use_smooth', face_smooth)
+        smooth &= face_smooth[faces_a] & face_smooth[faces_b]
+
+    # Face angles never exceed pi, so skip calculating them if the threshold
+    # cannot split any loops.
+    if angle < math.pi:
+        smooth &= calc_vector_angles(
+            face_normals[faces_a], face_normals[faces_b]) <= angle
+
+    smooth_edges = np.zeros(len(mesh.edges), dtype = bool)
+    smooth_edges[edges[smooth]] = True
+    return smooth_edges
+
+
+def group_loops(mesh, loop_pairs, smooth_edges, next_loops):
+    '''
+    Splits the loops of each vertex into shading groups of loops connected
+    across smooth edges, flattened such that loops of each group are contiguous
 
-            # Retreat to the previous pair of loops.
-            loop_curr = loop_prev
-            loop_prev = loop_curr.link_loop_prev.link_loop_radial_prev
+    Parameters:
+        mesh (bpy.types.Mesh): Mesh data
+        loop_pairs (tuple): Result of get_contiguous_loop_pairs()
+        smooth_edges (numpy.ndarray<bool>): Result of calc_smooth_edges()
+        next_loops (numpy.ndarray<int>): Next loop of each loop
 
-    return loop_groups
+    Returns:
+        (loops, group_starts, group_verts): Flattened shading groups
+            loops (numpy.ndarray<int>): Grouped loop indices
+            group_starts (numpy.ndarray<int>): Offset of each group's first loop
+            group_verts (numpy.ndarray<int>): Vertex shared by each group
+    '''
+    loop_verts = np.empty(len(mesh.loops), dtype = np.int64)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+
+    # Link the corners on both sides of each smooth, contiguous edge. The loop
+    # of one face starts at the vertex where the other face's next loop is.
+    edges, loops_a, loops_b = loop_pairs
+    smooth = smooth_edges[edges]
+    loops_a = loops_a[smooth]
+    loops_b = loops_b[smooth]
+    labels = label_components(
+        loop_verts.size,
+        np.concatenate((loops_a, loops_b)),
+        np.concatenate((next_loops[loops_b], next_loops[loops_a]))
+    )
+
+    # Order loops by group.
+    loops = np.argsort(labels, kind = 'stable')
+    sorted_labels = labels[loops]
+    group_starts = np.flatnonzero(
+        np.concatenate(([True], sorted_labels[1:] != sorted_labels[:-1])))
+    group_verts = loop_verts[loops[group_starts]]
+
+    return loops, group_starts, group_verts
 
 
 def pick_object(region, rv3d, x, y, near, far, objects):
@@ -134,16 +159,17 @@ def pick_object(region, rv3d, x, y, near, far, objects):
             continue
 
         # Cast ray in object space.
-        inverse_model_matrix = obj.matrix_world.inverted()
+        model_matrix = obj.matrix_world
+        inverse_model_matrix = model_matrix.inverted()
+        ray_origin = inverse_model_matrix @ ray_start
+        ray_direction = inverse_model_matrix @ ray_end - ray_origin
         hit =  obj.ray_cast(
-            inverse_model_matrix @ ray_start,
-            inverse_model_matrix @ ray_end
-        )
+            ray_origin, ray_direction, distance = ray_direction.length)
         location, normal, index = hit[1:]
 
         # Compare intersection distances.
         if index != -1:
-            dist_squared = (obj.matrix_world @ location - ray_start).length_squared
+            dist_squared = (model_matrix @ location - ray_start).length_squared
 
             # Record closer of the two hits.
             if dist_squared < min_dist_squared:
@@ -153,115 +179,354 @@ def pick_object(region, rv3d, x, y, near, far, objects):
     return result
 
 
-def loop_space_transform(loop, v, reverse = False):
+def loop_space_transform_batch(loops, vectors, reverse = False):
     '''
-    Transforms given vector from object space to loop-specific tangent space or
-    vice versa if reverse flag is set
+    Transforms given vectors from object space to the tangent space of the
+    corresponding loops or vice versa if reverse flag is set; the tangent
+    space basis of each loop consists of its normal, tangent, and their cross
+    product
 
     Parameters:
-        loop (bmesh.types.BMLoop): Loop from which to calculate tangent space
-        v (mathutils.Vector): Input vector
-        reverse (bool=False): Flag indicating direction of transformation
+        loops (seq<bmesh.types.BMLoop>): Loops from which to calculate tangent
+                                         spaces
+        vectors (numpy.ndarray<float>):  (L, 3) array of input vectors, or a
+                                         single vector shared by all loops
+        reverse (bool=False):            Flag indicating direction of
+                                         transformation
 
     Returns:
-        mathutils.Vector: Transformed vector
+        numpy.ndarray<float>: (L, 3) array of transformed vectors
     '''
-    # Define ortho-normal, loop-specific tangent space.
-    normal = loop.calc_normal()
-    tangent = loop.calc_tangent()
-    bitangent = normal.cross(tangent)
-
-    # Transform given vector.
-    m = mathutils.Matrix((normal, tangent, bitangent))
+    # Define ortho-normal, loop-specific tangent spaces.
+    bases = np.empty((len(loops), 3, 3), dtype = np.float64)
+    for basis, loop in zip(bases, loops):
+        normal = loop.calc_normal()
+        tangent = loop.calc_tangent()
+        basis[0] = normal
+        basis[1] = tangent
+        basis[2] = normal.cross(tangent)
+
+    # Transform given vectors.
+    vectors = np.broadcast_to(vectors, (len(loops), 3))
     if reverse:
-        m.transpose()
-    v = m @ v
+        return np.einsum('lji,lj->li', bases, vectors)
+    return np.einsum('lij,lj->li', bases, vectors)
+
 
-    return v
+def get_int_layer(layer):
+    '''
+    Reads all values of an integer custom data layer in one bulk transfer
 
+    Parameters:
+        layer (bpy.types.MeshVertexIntPropertyLayer or
+               bpy.types.MeshPolygonIntPropertyLayer): Mesh data layer
 
-def get_num_procs():
+    Returns:
+        numpy.ndarray<int>: Layer values
     '''
-    Determines the number of processors automatically detected by Blender
-      NOTE: multiprocessing.cpu_count() is unreliable
+    values = np.empty(len(layer.data), dtype = np.int32)
+    layer.data.foreach_get('value', values)
+    return values
+
+
+def get_selected_vert_indices(mesh):
+    '''
+    Determines which vertices are selected in one bulk transfer
+
+    Parameters:
+        mesh (bpy.types.Mesh): Mesh data
+
+    Pre:
+        Mesh data is up to date with Edit mode changes, if applicable.
 
     Returns:
-        int: Number of processors
+        numpy.ndarray<int>: Indices of selected vertices
     '''
-    render = bpy.context.scene.render
+    selected = np.empty(len(mesh.vertices), dtype = bool)
+    mesh.vertices.foreach_get('select', selected)
+    return np.flatnonzero(selected)
 
-    # Determine current scene's inital render settings.
-    initially_fixed = (render.threads_mode == 'FIXED')
-    initial_threads = render.threads
 
-    # Infer processor count from the number of render threads.
-    render.threads_mode = 'AUTO'
-    result = render.threads
+def get_selected_face_indices(mesh):
+    '''
+    Determines which faces are selected in one bulk transfer
 
-    # Restore current scene's render settings.
-    if initially_fixed:
-        render.threads_mode = 'FIXED'
-        render.threads = initial_threads
+    Parameters:
+        mesh (bpy.types.Mesh): Mesh data
 
-    return result
+    Pre:
+        Mesh data is up to date with Edit mode changes, if applicable.
+
+    Returns:
+        numpy.ndarray<int>: Indices of selected faces
+    '''
+    selected = np.empty(len(mesh.polygons), dtype = bool)
+    mesh.polygons.foreach_get('select', selected)
+    return np.flatnonzero(selected)
 
 
-def is_edge_smooth(edge, use_flat_faces = False):
+def get_vert_coords(mesh):
     '''
-    Determines if the given edge is smooth for shading purposes
+    Reads the local coordinates of each vertex in one bulk transfer
 
     Parameters:
-        edge (bmesh.types.BMEdge): Edge to evaluate
-        use_flat_faces(bool):      Flag controlling if edges along flat shaded
-                                   face boundaries are considered smooth
+        mesh (bpy.types.Mesh): Mesh data
+
+    Pre:
+        Mesh data is up to date with Edit mode changes, if applicable.
 
     Returns:
-        bool: True if edge is smooth; False otherwise
+        numpy.ndarray<float>: (V, 3) array of vertex coordinates
     '''
-    # Determine edge smoothness directly.
-    result = edge.smooth
+    coords = np.empty((len(mesh.vertices), 3), dtype = np.float32)
+    mesh.vertices.foreach_get('co', coords.ravel())
+    return coords
 
-    # Infer edge smoothness from linked faces.
-    if result and use_flat_faces:
-        for f in edge.link_faces:
-            if not f.smooth:
-                result = False
-                break
 
-    return result
+def get_split_normals(mesh):
+    '''
+    Reads the split normal of each loop in one bulk transfer
+
+    Parameters:
+        mesh (bpy.types.Mesh): Mesh data
+
+    Pre:
+        Split normals have been calculated via mesh.calc_normals_split().
+
+    Returns:
+        numpy.ndarray<float>: (L, 3) array of split normals
+    '''
+    split_normals = np.empty((len(mesh.loops), 3), dtype = np.float32)
+    mesh.loops.foreach_get('normal', split_normals.ravel())
+    return split_normals
 
 
-def get_linked_faces(face, angle = 0.0):
+def get_loop_topology(mesh):
     '''
-    Determines which faces are linked to given one
+    Determines the polygon, previous loop, and next loop of each loop
 
     Parameters:
-        face (bmesh.types.BMFace): Face for which to get linked faces
-        angle (float): Edge angle threshold in radians
+        mesh (bpy.types.Mesh): Mesh data
 
     Returns:
-        set<bmesh.types.BMFace>: Linked faces
+        (faces, prev_loops, next_loops): Arrays parallel to mesh loops
+            faces (numpy.ndarray<int>): Polygon that contains each loop
+            prev_loops (numpy.ndarray<int>): Previous loop in the same polygon
+            next_loops (numpy.ndarray<int>): Next loop in the same polygon
     '''
-    result = set()
-    traversal_stack = [face]
+    num_polygons = len(mesh.polygons)
+    num_loops = len(mesh.loops)
+
+    # Gather the range of loops that belongs to each polygon.
+    loop_starts = np.empty(num_polygons, dtype = np.int64)
+    loop_totals = np.empty(num_polygons, dtype = np.int64)
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+
+    # Determine the position of each loop within its polygon.
+    polygon_indices = np.repeat(np.arange(num_polygons), loop_totals)
+    starts = loop_starts[polygon_indices]
+    totals = loop_totals[polygon_indices]
+    offsets = np.arange(polygon_indices.size) - np.repeat(
+        np.cumsum(loop_totals) - loop_totals, loop_totals)
+    loop_indices = starts + offsets
+
+    # Scatter polygon-ordered results into loop order.
+    faces = np.empty(num_loops, dtype = np.int64)
+    prev_loops = np.empty(num_loops, dtype = np.int64)
+    next_loops = np.empty(num_loops, dtype = np.int64)
+    faces[loop_indices] = polygon_indices
+    prev_loops[loop_indices] = starts + (offsets - 1) % totals
+    next_loops[loop_indices] = starts + (offsets + 1) % totals
+
+    return faces, prev_loops, next_loops
+
+
+def get_vert_loops(mesh):
+    '''
+    Groups loops by the vertex they use, in compressed sparse row form
 
-    # Traverse staged faces.
-    while len(traversal_stack) > 0:
-        f_curr = traversal_stack.pop()
+    Parameters:
+        mesh (bpy.types.Mesh): Mesh data
 
-        # Accumulate results upon visiting a face.
-        result.add(f_curr)
+    Returns:
+        (vert_loop_starts, vert_loops): Vertex to loop mapping
+            vert_loop_starts (numpy.ndarray<int>): (V + 1) offsets such that
+                the loops of vertex i are vert_loops[starts[i]:starts[i + 1]]
+            vert_loops (numpy.ndarray<int>): Loop indices ordered by vertex
+    '''
+    loop_verts = np.empty(len(mesh.loops), dtype = np.int64)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+    vert_loops = np.argsort(loop_verts, kind = 'stable')
+    vert_loop_starts = np.zeros(len(mesh.vertices) + 1, dtype = np.int64)
+    np.cumsum(
+        np.bincount(loop_verts, minlength = len(mesh.vertices)),
+        out = vert_loop_starts[1:]
+    )
+    return vert_loop_starts, vert_loops
+
+
+def normalize_rows(vectors):
+    '''
+    Normalizes each row of given array of vectors in place; zero-length rows
+    are left unchanged
 
-        # Search contiguous faces.
-        for e in f_curr.edges:
-            if e.is_contiguous:
-                for f_linked in e.link_faces:
-                    if f_linked not in result:
+    Parameters:
+        vectors (numpy.ndarray<float>): (N, 3) array of vectors
 
-                        # Check if faces are within edge angle threshold.
-                        if f_curr.normal.angle(f_linked.normal) <= angle:
+    Returns:
+        numpy.ndarray<float>: Given array
+    '''
+    lengths = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+    np.divide(
+        vectors, lengths[:, None], out = vectors, where = lengths[:, None] > 0)
+    return vectors
 
-                            # Stage linked face for traversal.
-                            traversal_stack.append(f_linked)
 
-    return result
+def calc_loop_angles(mesh, prev_loops, next_loops):
+    '''
+    Calculates the corner angle of each loop, equivalent to
+    bmesh.types.BMLoop.calc_angle()
+
+    Parameters:
+        mesh (bpy.types.Mesh): Mesh data
+        prev_loops (numpy.ndarray<int>): Previous loop of each loop
+        next_loops (numpy.ndarray<int>): Next loop of each loop
+
+    Returns:
+        numpy.ndarray<float>: Corner angle of each loop in radians
+    '''
+    coords = np.empty((len(mesh.vertices), 3), dtype = np.float64)
+    mesh.vertices.foreach_get('co', coords.ravel())
+    loop_verts = np.empty(len(mesh.loops), dtype = np.int64)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+
+    # Determine unit vectors along both edges of each corner.
+    co = coords[loop_verts]
+    a = normalize_rows(coords[loop_verts[prev_loops]] - co)
+    b = normalize_rows(coords[loop_verts[next_loops]] - co)
+
+    return calc_vector_angles(a, b)
+
+
+def calc_vector_angles(a, b):
+    '''
+    Calculates the angle between each pair of unit vectors in a numerically
+    stable way near zero and pi
+
+    Parameters:
+        a (numpy.ndarray<float>): (N, 3) array of unit vectors
+        b (numpy.ndarray<float>): (N, 3) array of unit vectors
+
+    Returns:
+        numpy.ndarray<float>: Angle between each pair of vectors in radians
+    '''
+    dot = np.einsum('ij,ij->i', a, b)
+    diff = np.linalg.norm(a - b, axis = 1)
+    total = np.linalg.norm(a + b, axis = 1)
+    return np.where(
+        dot >= 0.0,
+        2.0 * np.arcsin(np.minimum(diff / 2.0, 1.0)),
+        math.pi - 2.0 * np.arcsin(np.minimum(total / 2.0, 1.0))
+    )
+
+
+def get_contiguous_loop_pairs(mesh):
+    '''
+    Determines the pair of loops along each contiguous edge, which is a
+    manifold edge whose faces have consistent winding
+
+    Parameters:
+        mesh (bpy.types.Mesh): Mesh data
+
+    Returns:
+        (edges, loops_a, loops_b): Arrays parallel to contiguous edges
+            edges (numpy.ndarray<int>): Index of each contiguous edge
+            loops_a (numpy.ndarray<int>): First loop along each edge
+            loops_b (numpy.ndarray<int>): Second loop along each edge
+    '''
+    loop_edges = np.empty(len(mesh.loops), dtype = np.int64)
+    loop_verts = np.empty(len(mesh.loops), dtype = np.int64)
+    mesh.loops.foreach_get('edge_index', loop_edges)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+
+    # Find the pair of loops along each manifold edge.
+    edge_loops = np.argsort(loop_edges, kind = 'stable')
+    edge_loop_counts = np.bincount(loop_edges, minlength = len(mesh.edges))
+    edge_loop_starts = np.cumsum(edge_loop_counts) - edge_loop_counts
+    manifold_starts = edge_loop_starts[edge_loop_counts == 2]
+    loops_a = edge_loops[manifold_starts]
+    loops_b = edge_loops[manifold_starts + 1]
+
+    # Loops of faces with consistent winding start at opposite vertices.
+    contiguous = loop_verts[loops_a] != loop_verts[loops_b]
+    loops_a = loops_a[contiguous]
+    loops_b = loops_b[contiguous]
+
+    return loop_edges[loops_a], loops_a, loops_b
+
+
+def label_components(count, links_a, links_b):
+    '''
+    Labels connected components of an undirected graph
+
+    Parameters:
+        count (int): Number of graph nodes
+        links_a (numpy.ndarray<int>): First node of each link
+        links_b (numpy.ndarray<int>): Second node of each link
+
+    Returns:
+        numpy.ndarray<int>: Lowest node index of the component of each node
+    '''
+    labels = np.arange(count)
+    while True:
+        labels_a = labels[links_a]
+        labels_b = labels[links_b]
+        unlinked = labels_a != labels_b
+        if not unlinked.any():
+            break
+
+        # Hook components onto the lowest label of any linked component.
+        labels_a = labels_a[unlinked]
+        labels_b = labels_b[unlinked]
+        np.minimum.at(labels, labels_a, labels_b)
+        np.minimum.at(labels, labels_b, labels_a)
+
+        # Compress paths until each node is labeled by the root of its tree.
+        while True:
+            parents = labels[labels]
+            if np.array_equal(parents, labels):
+                break
+            labels = parents
+
+    return labels
+
+
+def calc_linked_face_areas(loop_pairs, faces, face_normals, face_areas,
+                           angle = 0.0):
+    '''
+    Calculates the linked face area of each face, which is the total area of
+    all faces reachable across contiguous edges without crossing an angle
+    greater than given threshold between face normals
+
+    Parameters:
+        loop_pairs (tuple): Result of get_contiguous_loop_pairs()
+        faces (numpy.ndarray<int>): Polygon that contains each loop
+        face_normals (numpy.ndarray<float>): (F, 3) array of face normals
+        face_areas (numpy.ndarray<float>): Area of each face
+        angle (float): Edge angle threshold in radians
+
+    Returns:
+        numpy.ndarray<float>: Linked face area of each face
+    '''
+    edges, loops_a, loops_b = loop_pairs
+
+    # Link faces across contiguous edges within the edge angle threshold.
+    faces_a = faces[loops_a]
+    faces_b = faces[loops_b]
+    dot = np.einsum('ij,ij->i', face_normals[faces_a], face_normals[faces_b])
+    linked = dot >= math.cos(angle)
+    labels = label_components(len(face_areas), faces_a[linked], faces_b[linked])
+
+    # Sum the face areas of each linked group.
+    return np.bincount(labels, weights = face_areas)[labels]